@@ -1,29 +1,46 @@
 import asyncio
 
+from prompt_toolkit import PromptSession
+
+from task.clients.base import BaseClient
 from task.clients.client import DialClient
-from task.clients.custom_client import DialClient as CustomDialClient
-from task.constants import DEFAULT_SYSTEM_PROMPT
+from task.clients.semantic_cache import SemanticCache
+from task.constants import (
+    DEFAULT_SYSTEM_PROMPT,
+    PREFETCH_DELAY,
+    PREFETCH_ENABLED,
+    PREFETCH_SIMILARITY,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+)
 from task.models.conversation import Conversation
 from task.models.message import Message
 from task.models.role import Role
+from task.prefetch import Prefetcher
 
 
 async def start(stream: bool) -> None:
-    # Step 1.1 & 1.2: Create DialClient and CustomDialClient
+    # Step 1: Create DialClient (set DIAL_DEBUG=1 for request/response logging)
     # TODO: Replace 'gpt-4' with actual deployment name from https://ai-proxy.lab.epam.com/openai/models
     deployment_name = "gpt-4"
     
-    # You can switch between DialClient and CustomDialClient for testing (step 9)
     client = DialClient(deployment_name)
-    # Uncomment to use CustomDialClient (with request/response logging):
-    # client = CustomDialClient(deployment_name)
+    
+    # Optional near-match cache for paraphrased user turns
+    semantic_cache = None
+    if SEMANTIC_CACHE_ENABLED:
+        semantic_cache = SemanticCache(client.embed, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL)
     
     # Step 2: Create Conversation object
     conversation = Conversation()
     
+    # Read console input on the event loop, so background tasks keep running while the user types
+    prompt_session = PromptSession()
+    
     # Step 3: Get System prompt from console or use default
     print("Enter system prompt (or press Enter to use default):")
-    system_prompt_input = input("> ").strip()
+    system_prompt_input = (await prompt_session.prompt_async("> ")).strip()
     system_prompt = system_prompt_input if system_prompt_input else DEFAULT_SYSTEM_PROMPT
     
     # Add system message to conversation
@@ -33,11 +50,34 @@ async def start(stream: bool) -> None:
     print(f"\nSystem prompt set: {system_prompt}")
     print("\nChat started. Type 'exit' to quit.\n")
     
+    # Optional speculative completion of the prompt while it is being typed
+    prefetcher = None
+    if PREFETCH_ENABLED:
+        prefetcher = Prefetcher(client, PREFETCH_DELAY, PREFETCH_SIMILARITY, semantic_cache)
+        prompt_session.default_buffer.on_text_changed += (
+            lambda buffer: prefetcher.on_text_changed(conversation.get_messages(), buffer.text)
+        )
+    
     # Step 4: Infinite loop to get user messages
+    try:
+        await _chat_loop(client, conversation, semantic_cache, prefetcher, prompt_session, stream)
+    finally:
+        if prefetcher is not None:
+            prefetcher.cancel()
+        await client.aclose()
+
+
+async def _chat_loop(
+        client: BaseClient,
+        conversation: Conversation,
+        semantic_cache: SemanticCache | None,
+        prefetcher: Prefetcher | None,
+        prompt_session: PromptSession,
+        stream: bool
+) -> None:
     while True:
         # Get user input
-        print("You: ", end="", flush=True)
-        user_input = input().strip()
+        user_input = (await prompt_session.prompt_async("You: ")).strip()
         
         # Step 5: Check if user wants to exit
         if user_input.lower() == "exit":
@@ -55,12 +95,36 @@ async def start(stream: bool) -> None:
         # Step 7: Call appropriate completion method based on stream parameter
         print("Assistant: ", end="", flush=True)
         try:
-            if stream:
+            # Use the answer prefetched while typing if it was requested for a near-identical prompt
+            cached_message = None
+            if prefetcher is not None:
+                cached_message = await prefetcher.take(user_input)
+            
+            # Reuse the stored answer if a similar question was asked recently
+            query = None
+            if cached_message is None and semantic_cache is not None:
+                # The cache fails open, an embedding error must not fail the turn
+                try:
+                    query = await semantic_cache.embed_query(conversation.get_messages())
+                    cached_message = semantic_cache.lookup(query)
+                except Exception as e:
+                    print(f"\n[Semantic cache unavailable: {e}]")
+                    query = None
+            
+            if cached_message is not None:
+                print(cached_message.content)
+                assistant_message = cached_message
+            elif stream:
                 # Call stream_completion for streaming responses
                 assistant_message = await client.stream_completion(conversation.get_messages())
             else:
                 # Call get_completion for complete responses
-                assistant_message = client.get_completion(conversation.get_messages())
+                assistant_message = await client.get_completion(conversation.get_messages())
+            
+            # Empty or cut-off answers must not be replayed to later paraphrases
+            if (query is not None and cached_message is None
+                    and assistant_message.complete and assistant_message.content):
+                semantic_cache.store(query, assistant_message)
             
             # Step 8: Add generated message to history
             conversation.add_message(assistant_message)
@@ -68,7 +132,7 @@ async def start(stream: bool) -> None:
         except Exception as e:
             print(f"\nError: {e}")
             # Remove the user message from history if the request failed
-            conversation.messages.pop()
+            conversation.pop_message()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,18 @@
+import asyncio
 from abc import ABC, abstractmethod
 
-from task.constants import API_KEY
+from task.clients.cache import DiskResponseCache, MemoryResponseCache, ResponseCache, make_key
+from task.constants import (
+    API_KEY,
+    BATCH_CONCURRENCY,
+    CACHE_ENABLED,
+    CACHE_MAX_SIZE,
+    PERSIST_CACHE_DIR,
+    PERSIST_CACHE_ENABLED,
+    PERSIST_CACHE_TTL,
+)
 from task.models.message import Message
+from task.models.role import Role
 
 
 class BaseClient(ABC):
@@ -12,11 +23,70 @@ class BaseClient(ABC):
             raise ValueError("API key cannot be null or empty")
         self._api_key = api_key
         self._deployment_name= deployment_name
+        self._cache: ResponseCache | None = None
+        if PERSIST_CACHE_ENABLED:
+            self._cache = DiskResponseCache(PERSIST_CACHE_DIR, PERSIST_CACHE_TTL)
+        elif CACHE_ENABLED:
+            self._cache = MemoryResponseCache(CACHE_MAX_SIZE)
+
+    def _cache_key(self, messages: list[Message]) -> str | None:
+        """
+        Return cache key for the messages, or None if caching is disabled.
+        """
+        if self._cache is None:
+            return None
+        return make_key(self._deployment_name, [msg.to_dict() for msg in messages])
+
+    def _cache_get(self, key: str | None) -> str | None:
+        return self._cache.get(key) if key is not None else None
+
+    def _cache_set(self, key: str | None, content: str | None) -> None:
+        # Empty responses are never cached, a retry should reach the API again
+        if key is not None and content:
+            self._cache.set(key, content)
+
+    async def aclose(self) -> None:
+        """
+        Release network and cache resources held by the client.
+        """
+        if self._cache is not None:
+            self._cache.close()
+
+    async def get_completion(self, messages: list[Message]) -> Message:
+        """
+        Send asynchronous request to DIAL API, print and return complete AI response.
+        """
+        message = await self.complete(messages)
+        print(message.content)
+        return message
+
+    async def complete(self, messages: list[Message]) -> Message:
+        """
+        Return complete AI response without printing it, reusing the response cache.
+        """
+        cache_key = self._cache_key(messages)
+        content = self._cache_get(cache_key)
+        if content is None:
+            content = await self._complete(messages)
+            self._cache_set(cache_key, content)
+        return Message(role=Role.AI, content=content)
+
+    async def batch_completion(self, conversations: list[list[Message]]) -> list[Message]:
+        """
+        Complete independent conversations concurrently and return responses in the same order.
+        """
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def complete_one(messages: list[Message]) -> Message:
+            async with semaphore:
+                return await self.complete(messages)
+
+        return list(await asyncio.gather(*(complete_one(messages) for messages in conversations)))
 
     @abstractmethod
-    def get_completion(self, messages: list[Message]) -> Message:
+    async def _complete(self, messages: list[Message]) -> str:
         """
-        Send synchronous request to DIAL API and return AI response.
+        Send asynchronous request to DIAL API and return content of the AI response.
         """
         ...
 
@@ -25,4 +95,11 @@ class BaseClient(ABC):
         """
         Send asynchronous streaming request to DIAL API and return AI response.
         """
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    async def embed(self, text: str) -> list[float]:
+        """
+        Send asynchronous request to DIAL embeddings API and return embedding vector.
+        """
+        ...
@@ -0,0 +1,70 @@
+import hashlib
+from collections import OrderedDict
+from typing import Protocol
+
+import orjson
+from diskcache import Cache
+
+
+def make_key(deployment_name: str, messages_dict: list[dict[str, str]]) -> str:
+    payload = {"deployment_name": deployment_name, "messages": messages_dict}
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class ResponseCache(Protocol):
+    """
+    Maps a hash of the request to the assistant response content.
+    """
+
+    def get(self, key: str) -> str | None:
+        ...
+
+    def set(self, key: str, content: str) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class MemoryResponseCache:
+    """
+    In-memory LRU response cache.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        self._entries[key] = content
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        self._entries.clear()
+
+
+class DiskResponseCache:
+    """
+    Response cache persisted on disk, so previously seen prompts survive process restarts.
+    """
+
+    def __init__(self, directory: str, ttl: float):
+        self._ttl = ttl
+        self._disk = Cache(directory)
+
+    def get(self, key: str) -> str | None:
+        return self._disk.get(key)
+
+    def set(self, key: str, content: str) -> None:
+        self._disk.set(key, content, expire=self._ttl)
+
+    def close(self) -> None:
+        self._disk.close()
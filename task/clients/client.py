@@ -1,75 +1,243 @@
-from aidial_client import Dial, AsyncDial
+import asyncio
+import io
+import sys
+import aiohttp
+import orjson
 
 from task.clients.base import BaseClient
-from task.constants import DIAL_ENDPOINT
+from task.constants import DEBUG, DIAL_ENDPOINT, EMBEDDING_DEPLOYMENT
 from task.models.message import Message
 from task.models.role import Role
 
 
+class _StdoutBatcher:
+    """
+    Writes streamed text to stdout in batches, with one flush (write syscall) per batch
+    instead of a flushed print() per chunk. Pending text is flushed once it reaches
+    min_chars or after max_delay, whichever comes first.
+    """
+
+    def __init__(self, min_chars: int = 64, max_delay: float = 0.016):
+        self._min_chars = min_chars
+        self._max_delay = max_delay
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def write(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= self._min_chars:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        # Goes through sys.stdout so its encoding and console writer are respected
+        sys.stdout.write("".join(self._pending))
+        sys.stdout.flush()
+        self._pending.clear()
+        self._pending_chars = 0
+
+
 class DialClient(BaseClient):
+    _endpoint: str
+    _embeddings_endpoint: str
+    _headers: dict[str, str]
+    _session: aiohttp.ClientSession | None
 
     def __init__(self, deployment_name: str):
         super().__init__(deployment_name)
-        # Create Dial client for synchronous requests
-        self._client = Dial(
-            base_url=DIAL_ENDPOINT,
-            api_key=self._api_key
-        )
-        # Create AsyncDial client for streaming requests
-        self._async_client = AsyncDial(
-            base_url=DIAL_ENDPOINT,
-            api_key=self._api_key
-        )
+        self._endpoint = DIAL_ENDPOINT + f"/openai/deployments/{deployment_name}/chat/completions"
+        self._embeddings_endpoint = DIAL_ENDPOINT + f"/openai/deployments/{EMBEDDING_DEPLOYMENT}/embeddings"
+        self._headers = {
+            "api-key": self._api_key,
+            "Content-Type": "application/json"
+        }
+        # Session is created lazily since there is no running event loop yet
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Reuse one session so follow-up requests go over a warm TCP+TLS connection
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                # Cache DNS and keep idle connections well past aiohttp's 15s default, so bursty
+                # usage after a pause does not pay a fresh DNS lookup and TLS handshake
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=120,
+                    enable_cleanup_closed=True
+                ),
+                # Recycle stuck connections instead of hanging the chat on them; no total limit,
+                # since a long streamed answer may legitimately take more than a minute
+                timeout=aiohttp.ClientTimeout(total=None, connect=5, sock_read=60),
+                headers=self._headers,
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        await super().aclose()
 
-    def get_completion(self, messages: list[Message]) -> Message:
-        # Convert messages to dict format for API
-        messages_dict = [msg.to_dict() for msg in messages]
+    async def _complete(self, messages: list[Message]) -> str:
+        # Reuse the shared aiohttp.ClientSession (carries api-key and Content-Type headers)
+        session = await self._get_session()
         
-        # Create chat completions with client
-        response = self._client.chat.completions.create(
-            deployment_name=self._deployment_name,
-            messages=messages_dict
-        )
+        # Create request_data dictionary with messages
+        request_data = {
+            "messages": [msg.to_dict() for msg in messages]
+        }
         
-        # Check if choices are present
-        if not response.choices:
-            raise Exception("No choices in response found")
+        # Print request for logging (Step 10), only when DIAL_DEBUG is set
+        if DEBUG:
+            print("\n=== REQUEST ===")
+            print(f"URL: {self._endpoint}")
+            print(f"Headers: {orjson.dumps(self._headers, option=orjson.OPT_INDENT_2).decode()}")
+            print(f"Body: {orjson.dumps(request_data, option=orjson.OPT_INDENT_2).decode()}")
+            print("===============\n")
         
-        # Get content from response
-        content = response.choices[0].message.content
+        # Make POST request without blocking the event loop. A non-streamed response sends no
+        # bytes until generation finishes, so the session's sock_read limit is lifted here
+        async with session.post(
+            self._endpoint,
+            json=request_data,
+            timeout=aiohttp.ClientTimeout(total=None, connect=5, sock_read=None)
+        ) as response:
+            status = response.status
+            response_body = await response.read()
+        
+        # Check status code
+        if status != 200:
+            raise Exception(f"HTTP {status}: {response_body.decode('utf-8', errors='replace')}")
         
-        # Print the response
-        print(content)
+        response_json = orjson.loads(response_body)
         
-        # Return message with assistant role and content
-        return Message(role=Role.AI, content=content)
+        # Print response for logging (Step 10)
+        if DEBUG:
+            print("\n=== RESPONSE ===")
+            print(f"Status Code: {status}")
+            print(f"Response: {orjson.dumps(response_json, option=orjson.OPT_INDENT_2).decode()}")
+            print("================\n")
+        
+        # Get content from response
+        return response_json["choices"][0]["message"]["content"]
 
     async def stream_completion(self, messages: list[Message]) -> Message:
-        # Convert messages to dict format for API
-        messages_dict = [msg.to_dict() for msg in messages]
-        
-        # Create chat completions with async client with streaming enabled
-        response = await self._async_client.chat.completions.create(
-            deployment_name=self._deployment_name,
-            messages=messages_dict,
-            stream=True
-        )
+        # Return cached response for an identical request
+        cache_key = self._cache_key(messages)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            print(cached)
+            return Message(role=Role.AI, content=cached)
+
+        # Reuse the shared aiohttp.ClientSession (carries api-key and Content-Type headers)
+        session = await self._get_session()
         
-        # Create array to collect content chunks
-        contents = []
+        # Create request_data dictionary with stream enabled
+        request_data = {
+            "stream": True,
+            "messages": [msg.to_dict() for msg in messages]
+        }
         
-        # Make async loop from chunks
-        async for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                content_chunk = chunk.choices[0].delta.content
-                # Print content chunk
-                print(content_chunk, end="", flush=True)
-                # Collect it in contents array
-                contents.append(content_chunk)
+        # Print request for logging (Step 10), only when DIAL_DEBUG is set
+        if DEBUG:
+            print("\n=== STREAM REQUEST ===")
+            print(f"URL: {self._endpoint}")
+            print(f"Headers: {orjson.dumps(self._headers, option=orjson.OPT_INDENT_2).decode()}")
+            print(f"Body: {orjson.dumps(request_data, option=orjson.OPT_INDENT_2).decode()}")
+            print("======================\n")
         
-        # Print empty row to end streaming output
-        print()
+        # Collect content snippets in a growable buffer
+        contents = io.StringIO()
+        completed = False
         
+        # Make POST request using async with
+        async with session.post(
+            self._endpoint,
+            json=request_data
+        ) as response:
+            # Check status code, error responses carry no SSE events
+            if response.status != 200:
+                raise Exception(f"HTTP {response.status}: {await response.text()}")
+            
+            # Print response status for logging (Step 10)
+            if DEBUG:
+                print(f"\n=== STREAM RESPONSE (Status: {response.status}) ===")
+            
+            # Created after the last print() so batched writes stay in order with it
+            stdout = _StdoutBatcher()
+            
+            # Flush leftovers on every exit, so partial text never shows up after a later error message
+            try:
+                # Read response line by line
+                async for line in response.content:
+                    # Work on raw bytes, orjson parses them without a separate decode
+                    line = line.strip()
+                    
+                    # Skip empty lines
+                    if not line:
+                        continue
+                    
+                    # Check if line starts with 'data: '
+                    if line.startswith(b'data: '):
+                        data_content = line[6:]  # Remove 'data: ' prefix
+                        
+                        # Check for end of stream
+                        if data_content == b'[DONE]':
+                            completed = True
+                            stdout.flush()
+                            if DEBUG:
+                                print("\n[Stream completed]")
+                            break
+                        
+                        # Parse JSON chunk
+                        try:
+                            chunk_json = orjson.loads(data_content)
+                            
+                            # Extract content from chunk
+                            if 'choices' in chunk_json and len(chunk_json['choices']) > 0:
+                                delta = chunk_json['choices'][0].get('delta', {})
+                                content_chunk = delta.get('content')
+                                if content_chunk:
+                                    # Print content chunk
+                                    stdout.write(content_chunk)
+                                    # Collect in contents buffer
+                                    contents.write(content_chunk)
+                        except orjson.JSONDecodeError:
+                            # Skip malformed JSON
+                            continue
+            finally:
+                stdout.flush()
+            
+            if DEBUG:
+                print("\n======================\n")
+            else:
+                # Print empty row to end streaming output
+                print()
+    
         # Return Message with assistant role and collected content
-        full_content = "".join(contents)
-        return Message(role=Role.AI, content=full_content)
+        full_content = contents.getvalue()
+        # A stream cut off before [DONE] holds a partial answer, which must not be replayed
+        if completed:
+            self._cache_set(cache_key, full_content)
+        return Message(role=Role.AI, content=full_content, complete=completed)
+
+    async def embed(self, text: str) -> list[float]:
+        session = await self._get_session()
+        async with session.post(
+            self._embeddings_endpoint,
+            json={"input": text}
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"HTTP {response.status}: {await response.text()}")
+            response_json = await response.json()
+        return response_json["data"][0]["embedding"]
@@ -0,0 +1,61 @@
+import time
+from typing import Awaitable, Callable
+
+import numpy as np
+
+from task.models.message import Message
+from task.models.role import Role
+
+
+class SemanticCache:
+    """
+    Near-match cache keyed by the embedding of the system prompt, the last user message and
+    the assistant reply preceding it, so context-dependent follow-ups do not match across topics.
+    """
+
+    def __init__(self, embed: Callable[[str], Awaitable[list[float]]], threshold: float, ttl: float):
+        self._embed = embed
+        self._threshold = threshold
+        self._ttl = ttl
+        self._created_at: list[float] = []
+        self._messages: list[Message] = []
+        # One L2-normalized row per entry, so a single matmul yields all cosine similarities
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    async def embed_query(self, messages: list[Message]) -> np.ndarray:
+        system = next((msg.content for msg in messages if msg.role == Role.SYSTEM), "")
+        user_index = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].role == Role.USER), None)
+        user = messages[user_index].content if user_index is not None else ""
+        previous = next(
+            (msg.content for msg in reversed(messages[:user_index or 0]) if msg.role == Role.AI), ""
+        )
+        vector = np.asarray(await self._embed(f"{system}\n{previous}\n{user}"), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, query: np.ndarray) -> Message | None:
+        self._evict_expired()
+        if not self._messages:
+            return None
+        similarities = self._matrix @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] > self._threshold:
+            return self._messages[best]
+        return None
+
+    def store(self, query: np.ndarray, message: Message) -> None:
+        self._evict_expired()
+        self._matrix = np.vstack([self._matrix, query]) if self._messages else query[np.newaxis, :]
+        self._messages.append(message)
+        self._created_at.append(time.monotonic())
+
+    def _evict_expired(self) -> None:
+        deadline = time.monotonic() - self._ttl
+        # Entries are appended in creation order, so expired ones form a prefix
+        expired = 0
+        while expired < len(self._created_at) and self._created_at[expired] < deadline:
+            expired += 1
+        if expired:
+            del self._created_at[:expired]
+            del self._messages[:expired]
+            self._matrix = self._matrix[expired:]
@@ -2,4 +2,27 @@ import os
 
 DEFAULT_SYSTEM_PROMPT = "You are an assistant who answers concisely and informatively."
 DIAL_ENDPOINT = "https://ai-proxy.lab.epam.com"
-API_KEY = os.getenv('DIAL_API_KEY', '')
\ No newline at end of file
+API_KEY = os.getenv('DIAL_API_KEY', '')
+# Verbose request/response logging in DialClient
+DEBUG = bool(os.getenv('DIAL_DEBUG'))
+# Exact-match response cache, disable for non-deterministic (temperature > 0) sessions
+CACHE_ENABLED = os.getenv('DIAL_CACHE', '') == '1'
+CACHE_MAX_SIZE = 512
+# Persist the response cache across restarts, takes precedence over the in-memory cache
+PERSIST_CACHE_ENABLED = os.getenv('DIAL_PERSIST_CACHE', '') == '1'
+PERSIST_CACHE_DIR = os.path.expanduser(os.getenv('DIAL_CACHE_DIR', '~/.cache/dial'))
+PERSIST_CACHE_TTL = 3600
+# Max in-flight requests for batch completion, stays within the DialClient connection pool
+BATCH_CONCURRENCY = 10
+# Embedding-based near-match cache for paraphrased user turns
+SEMANTIC_CACHE_ENABLED = os.getenv('DIAL_SEMANTIC_CACHE', '') == '1'
+EMBEDDING_DEPLOYMENT = os.getenv('DIAL_EMBEDDING_DEPLOYMENT', 'text-embedding-ada-002')
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL = 3600
+# Speculative completion of the prompt while it is still being typed
+PREFETCH_ENABLED = os.getenv('DIAL_PREFETCH', '') == '1'
+PREFETCH_DELAY = 0.4
+PREFETCH_SIMILARITY = 0.95
+# Sliding window for conversation history sent to the API, the system prompt is always kept
+MAX_CONVERSATION_TOKENS = 4096
+TOKENIZER_MODEL = "gpt-4"
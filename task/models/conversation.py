@@ -1,17 +1,71 @@
 import uuid
 from dataclasses import dataclass, field
+from functools import cache
 
+import tiktoken
+
+from task.constants import MAX_CONVERSATION_TOKENS, TOKENIZER_MODEL
 from task.models.message import Message
+from task.models.role import Role
+
+
+@cache
+def _encoding() -> tiktoken.Encoding:
+    return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+
+
+def _count_tokens(message: Message) -> int:
+    # Filtered or tool-call replies may carry no content
+    return len(_encoding().encode(message.content or ""))
 
 
 @dataclass
 class Conversation:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     messages: list[Message] = field(default_factory=list)
+    max_tokens: int = MAX_CONVERSATION_TOKENS
+    # Per-message token counts, so truncation never re-encodes the history
+    _token_counts: list[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._token_counts = [_count_tokens(message) for message in self.messages]
+        self.truncate(self.max_tokens)
 
     def add_message(self, message: Message) -> None:
+        # Extra context goes in its own user message, the system prefix must stay unchanged
+        if message.role == Role.SYSTEM and self.messages:
+            raise ValueError("System message can only be the first message in conversation")
+        # Count first, so a failure leaves messages and token counts in sync
+        token_count = _count_tokens(message)
         self.messages.append(message)
+        self._token_counts.append(token_count)
+        # Truncate once the turn is complete, so a failed request rolled back with
+        # pop_message() has not already cost earlier history
+        if message.role == Role.AI:
+            self.truncate(self.max_tokens)
+
+    def truncate(self, max_tokens: int) -> None:
+        """
+        Drop the oldest non-system turns until the history fits into max_tokens.
+        A user message is dropped together with the assistant reply that follows it,
+        and the latest turn is always kept.
+        """
+        first = 1 if self.messages and self.messages[0].role == Role.SYSTEM else 0
+        total = sum(self._token_counts)
+        while total > max_tokens and first < len(self.messages):
+            count = 1
+            if (self.messages[first].role == Role.USER and first + 1 < len(self.messages)
+                    and self.messages[first + 1].role == Role.AI):
+                count = 2
+            if first + count >= len(self.messages):
+                break
+            del self.messages[first:first + count]
+            total -= sum(self._token_counts[first:first + count])
+            del self._token_counts[first:first + count]
+
+    def pop_message(self) -> Message:
+        self._token_counts.pop()
+        return self.messages.pop()
 
     def get_messages(self) -> list[Message]:
         return self.messages
-    
\ No newline at end of file
@@ -1,15 +1,23 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from task.models.role import Role
 
 
-@dataclass
+@dataclass(frozen=True)
 class Message:
     role: Role
     content: str
+    # False for a streamed answer cut off before the end of stream, such answers are not cached
+    complete: bool = field(default=True, compare=False)
+    # Wire format is built once so re-sending the history each turn allocates nothing new
+    _dict: dict[str, str] = field(init=False, repr=False, compare=False)
 
-    def to_dict(self) -> dict[str, str]:
-        return {
+    def __post_init__(self) -> None:
+        # Frozen so the serialized prefix stays byte-identical across requests (prompt caching)
+        object.__setattr__(self, "_dict", {
             "role": self.role.value,
             "content": self.content
-        }
\ No newline at end of file
+        })
+
+    def to_dict(self) -> dict[str, str]:
+        return self._dict
@@ -0,0 +1,82 @@
+import asyncio
+from difflib import SequenceMatcher
+
+from task.clients.base import BaseClient
+from task.clients.semantic_cache import SemanticCache
+from task.models.message import Message
+from task.models.role import Role
+
+
+class Prefetcher:
+    """
+    Requests a completion for the partially typed prompt once typing pauses, so the answer
+    may already be available when the user submits a (nearly) identical final prompt.
+    """
+
+    def __init__(
+            self,
+            client: BaseClient,
+            delay: float,
+            similarity: float,
+            semantic_cache: SemanticCache | None = None
+    ):
+        self._client = client
+        self._delay = delay
+        self._similarity = similarity
+        self._semantic_cache = semantic_cache
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[Message] | None = None
+        self._partial = ""
+
+    def on_text_changed(self, history: list[Message], text: str) -> None:
+        # Debounce: only the text left in place for `delay` seconds is prefetched
+        if self._timer is not None:
+            self._timer.cancel()
+        text = text.strip()
+        if text and text != self._partial:
+            self._timer = asyncio.get_running_loop().call_later(self._delay, self._launch, list(history), text)
+
+    async def take(self, final_text: str) -> Message | None:
+        """
+        Return the prefetched response if it was requested for a prompt close to the final one.
+        """
+        task, partial = self._task, self._partial
+        if task is None or SequenceMatcher(None, partial, final_text).ratio() <= self._similarity:
+            self.cancel()
+            return None
+        # Detach the matching task so cancel() leaves it running
+        self._task = None
+        self.cancel()
+        try:
+            return await task
+        except Exception:
+            return None
+
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Finished tasks have already populated the caches, so only running ones are cancelled
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._partial = ""
+
+    def _launch(self, history: list[Message], text: str) -> None:
+        self._timer = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._partial = text
+        self._task = asyncio.create_task(self._fetch(history + [Message(role=Role.USER, content=text)]))
+        # Retrieve exceptions of abandoned tasks so they are not reported as never retrieved
+        self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def _fetch(self, messages: list[Message]) -> Message:
+        message = await self._client.complete(messages)
+        if self._semantic_cache is not None and message.content:
+            # The cache fails open, an embedding error must not discard the prefetched answer
+            try:
+                self._semantic_cache.store(await self._semantic_cache.embed_query(messages), message)
+            except Exception:
+                pass
+        return message